@@ -26,10 +26,11 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 import re
 import inspect
+import collections
 import logging
 import datetime
 
-log = logging.getLogger(__file__)
+log = logging.getLogger(__name__)
 
 # Import third party libs
 from salt.ext import six
@@ -41,6 +42,7 @@ except ImportError:
 
 # Import Salt libs
 import salt.utils.files
+import salt.utils.json
 
 # ------------------------------------------------------------------------------
 # module properties
@@ -313,7 +315,6 @@ def _clean_term_opts(term_opts):
     - create lists for those fields requiring it
     '''
     clean_opts = {}
-    _services = _get_services_mapping()
     for field, value in six.iteritems(term_opts):
         # firstly we'll process special fields like source_service or destination_services
         # which will inject values directly in the source or destination port and protocol
@@ -322,6 +323,10 @@ def _clean_term_opts(term_opts):
                 value = _make_it_list(clean_opts, field, value)
             log.debug('Processing special source services:')
             log.debug(value)
+            # the /etc/services mapping is built only when services are referenced,
+            # then cached in _SERVICES -- when the file cannot be read,
+            # the mapping stays empty and is attempted again on the next call
+            _services = _get_services_mapping()
             for service in value:
                 if service and service in _services:
                     # if valid source_service
@@ -341,6 +346,7 @@ def _clean_term_opts(term_opts):
                 value = _make_it_list(clean_opts, field, value)
             log.debug('Processing special destination services:')
             log.debug(value)
+            _services = _get_services_mapping()
             for service in value:
                 if service and service in _services:
                     # if valid destination_service
@@ -450,22 +456,20 @@ def _merge_list_of_dict(first, second, prepend=True):
     return merged
 
 
-def _get_term_object(filter_name,
-                     term_name,
-                     pillar_key='acl',
-                     pillarenv=None,
-                     saltenv=None,
-                     merge_pillar=True,
-                     **term_fields):
+def _get_term_opts(filter_name,
+                   term_name,
+                   pillar_key='acl',
+                   pillarenv=None,
+                   saltenv=None,
+                   merge_pillar=True,
+                   **term_fields):
     '''
-    Return an instance of the ``_Term`` class given the term options.
+    Return the clean term options, merged with the pillar data when required.
     '''
     log.debug('Generating config for term {tname} under filter {fname}'.format(
         tname=term_name,
         fname=filter_name
     ))
-    term = _Term()
-    term.name = term_name
     term_opts = {}
     if merge_pillar:
         term_opts = get_term_pillar(filter_name,
@@ -486,8 +490,20 @@ def _get_term_object(filter_name,
     log.debug('Final term opts:')
     term_opts.update(term_fields)
     log.debug(term_fields)
+    return term_opts
+
+
+def _get_term_object(term_name, term_opts):
+    '''
+    Return an instance of the ``_Term`` class given the clean term options.
+    The same options can be shared by several terms, so the lists are copied.
+    '''
+    term = _Term()
+    term.name = term_name
     for field, value in six.iteritems(term_opts):
         # setting the field attributes to the term instance of _Term
+        if isinstance(value, list):
+            value = value[:]
         setattr(term, field, value)
     log.debug('Term config:')
     log.debug(six.text_type(term))
@@ -507,11 +523,24 @@ def _get_policy_object(platform,
     policy_filters = []
     if not filters:
         filters = []
+    # the same term used under several filters is cleaned up only once;
+    # only the term names that repeat are worth serializing to identify the bodies
+    # -- unless merging with the pillar, as the pillar data depends on the filter name
+    repeated_terms = set()
+    if not merge_pillar:
+        term_names_count = collections.Counter(
+            term_name
+            for filter_ in filters if filter_ and isinstance(filter_, dict)
+            for filter_config in six.itervalues(filter_)
+            for term_ in filter_config.get('terms', []) if term_ and isinstance(term_, dict)
+            for term_name in term_
+        )
+        repeated_terms = set(term_name for term_name, count in six.iteritems(term_names_count) if count > 1)
+    terms_opts = {}
     for filter_ in filters:
         if not filter_ or not isinstance(filter_, dict):
             continue  # go to the next filter
-        filter_name = filter_.keys()[0]
-        filter_config = filter_.values()[0]
+        filter_name, filter_config = next(six.iteritems(filter_))
         header = aclgen.policy.Header()  # same header everywhere
         target_opts = [
             platform,
@@ -527,15 +556,26 @@ def _get_policy_object(platform,
         filter_terms = []
         for term_ in filter_config.get('terms', []):
             if term_ and isinstance(term_, dict):
-                term_name = term_.keys()[0]
-                term_fields = term_.values()[0]
-                term = _get_term_object(filter_name,
-                                        term_name,
-                                        pillar_key=pillar_key,
-                                        pillarenv=pillarenv,
-                                        saltenv=saltenv,
-                                        merge_pillar=merge_pillar,
-                                        **term_fields)
+                term_name, term_fields = next(six.iteritems(term_))
+                term_key = None
+                if term_name in repeated_terms:
+                    try:
+                        term_key = (term_name, salt.utils.json.dumps(term_fields, sort_keys=True))
+                    except TypeError:
+                        log.debug('Unable to serialize the fields of {tname}, will not be reused'.format(
+                            tname=term_name))
+                term_opts = terms_opts.get(term_key) if term_key else None
+                if term_opts is None:
+                    term_opts = _get_term_opts(filter_name,
+                                               term_name,
+                                               pillar_key=pillar_key,
+                                               pillarenv=pillarenv,
+                                               saltenv=saltenv,
+                                               merge_pillar=merge_pillar,
+                                               **term_fields)
+                    if term_key:
+                        terms_opts[term_key] = term_opts
+                term = _get_term_object(term_name, term_opts)
             filter_terms.append(term)
         policy_filters.append(
             (header, filter_terms)
@@ -568,7 +608,7 @@ def _revision_tag(text,
     those tags with the content requested by the user.
     If a certain value is not provided, the corresponding tag will be stripped.
     '''
-    timestamp = datetime.datetime.now().strftime(revision_date_format)
+    timestamp = None
     new_text = []
     for line in text.splitlines():
         if '$Id:$' in line:
@@ -582,6 +622,9 @@ def _revision_tag(text,
         if '$Date:$' in line:
             if not revision_date:
                 continue  # jump
+            if timestamp is None:
+                # formatted once, the same date is used for all the filters
+                timestamp = datetime.datetime.now().strftime(revision_date_format)
             line = line.replace('$Date:$', '$Date: {ts} $'.format(ts=timestamp))
         new_text.append(line)
     return '\n'.join(new_text)
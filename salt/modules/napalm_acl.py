@@ -29,7 +29,7 @@ Please check Installation_ for complete details.
 from __future__ import absolute_import, unicode_literals, print_function
 
 import logging
-log = logging.getLogger(__file__)
+log = logging.getLogger(__name__)
 
 # Import third party libs
 try:
@@ -850,6 +850,96 @@ def load_policy_config(filters=None,
                                        inherit_napalm_device=napalm_device)  # pylint: disable=undefined-variable
 
 
+def get_filter_config(filter_name,
+                      filter_options=None,
+                      terms=None,
+                      prepend=True,
+                      pillar_key='acl',
+                      pillarenv=None,
+                      saltenv=None,
+                      merge_pillar=True,
+                      only_lower_merge=False,
+                      revision_id=None,
+                      revision_no=None,
+                      revision_date=True,
+                      revision_date_format='%Y/%m/%d',
+                      **kwargs):  # pylint: disable=unused-argument
+    '''
+    Generate the configuration of a policy filter, without loading it on the device.
+    The Capirca platform is determined from the NAPALM grains.
+
+    This function accepts the same arguments as :mod:`load_filter_config <salt.modules.napalm_acl.load_filter_config>`,
+    except ``test``, ``commit`` and ``debug``.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt 'edge01.flw01' netacl.get_filter_config my-filter pillar_key=netacl
+    '''
+    if not filter_options:
+        filter_options = []
+    if not terms:
+        terms = []
+    platform = _get_capirca_platform()
+    return __salt__['capirca.get_filter_config'](platform,
+                                                 filter_name,
+                                                 terms=terms,
+                                                 prepend=prepend,
+                                                 filter_options=filter_options,
+                                                 pillar_key=pillar_key,
+                                                 pillarenv=pillarenv,
+                                                 saltenv=saltenv,
+                                                 merge_pillar=merge_pillar,
+                                                 only_lower_merge=only_lower_merge,
+                                                 revision_id=revision_id,
+                                                 revision_no=revision_no,
+                                                 revision_date=revision_date,
+                                                 revision_date_format=revision_date_format)
+
+
+def get_policy_config(filters=None,
+                      prepend=True,
+                      pillar_key='acl',
+                      pillarenv=None,
+                      saltenv=None,
+                      merge_pillar=True,
+                      only_lower_merge=False,
+                      revision_id=None,
+                      revision_no=None,
+                      revision_date=True,
+                      revision_date_format='%Y/%m/%d',
+                      **kwargs):  # pylint: disable=unused-argument
+    '''
+    Generate the configuration of the whole policy, without loading it on the device.
+    The Capirca platform is determined from the NAPALM grains.
+
+    This function accepts the same arguments as :mod:`load_policy_config <salt.modules.napalm_acl.load_policy_config>`,
+    except ``test``, ``commit`` and ``debug``.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt 'edge01.flw01' netacl.get_policy_config pillar_key=netacl
+    '''
+    if not filters:
+        filters = []
+    platform = _get_capirca_platform()
+    return __salt__['capirca.get_policy_config'](platform,
+                                                 filters=filters,
+                                                 prepend=prepend,
+                                                 pillar_key=pillar_key,
+                                                 pillarenv=pillarenv,
+                                                 saltenv=saltenv,
+                                                 merge_pillar=merge_pillar,
+                                                 only_lower_merge=only_lower_merge,
+                                                 revision_id=revision_id,
+                                                 revision_no=revision_no,
+                                                 revision_date=revision_date,
+                                                 revision_date_format=revision_date_format)
+
+
 def get_filter_pillar(filter_name,
                       pillar_key='acl',
                       pillarenv=None,
@@ -26,30 +26,40 @@ Please check Installation_ for complete details.
 
 .. _NAPALM: https://napalm.readthedocs.io
 .. _Installation: https://napalm.readthedocs.io/en/latest/installation.html
+
+Device sessions
+---------------
+
+When running under the NAPALM proxy with ``always_alive`` enabled (default),
+the connection with the network device is established once, then reused
+by all the states below, as well as by any other NAPALM-based function.
+When ``always_alive`` is disabled, or when running on a regular minion,
+each state opens a new session and closes it after loading the configuration.
+In that case, to reduce the number of sessions, prefer the ``terms`` and
+``managed`` states, which generate and load more configuration at once.
 '''
 from __future__ import absolute_import, print_function, unicode_literals
 
+import hashlib
 import logging
-log = logging.getLogger(__file__)
+log = logging.getLogger(__name__)
 
 # Import third party libs
 try:
-    # pylint: disable=W0611
-    import aclgen
-    HAS_CAPIRCA = True
-    # pylint: enable=W0611
-except ImportError:
-    HAS_CAPIRCA = False
-
-try:
-    # pylint: disable=W0611
-    import napalm_base
-    # pylint: enable=W0611
-    HAS_NAPALM = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_NAPALM = False
+    HAS_ORJSON = False
 
+# Import Salt libs
+from salt.ext import six
+from salt._compat import ipaddress
+import salt.utils.json
 import salt.utils.napalm
+# private aliases, so the loader does not expose them as states
+from salt.utils.napalm import default_ret as _default_ret
+from salt.utils.napalm import loaded_ret as _loaded_ret
+import salt.utils.stringutils
 
 # ------------------------------------------------------------------------------
 # state properties
@@ -61,6 +71,88 @@ __virtualname__ = 'netacl'
 # global variables
 # ------------------------------------------------------------------------------
 
+# the term fields accepted by Capirca
+# (see _TERM_FIELDS in the capirca execution module),
+# plus the service helpers translated into ports and protocols
+_VALID_TERM_FIELDS = frozenset([
+    'action',
+    'address',
+    'address_exclude',
+    'comment',
+    'counter',
+    'expiration',
+    'destination_address',
+    'destination_address_exclude',
+    'destination_port',
+    'destination_prefix',
+    'forwarding_class',
+    'forwarding_class_except',
+    'logging',
+    'log_name',
+    'loss_priority',
+    'option',
+    'owner',
+    'policer',
+    'port',
+    'precedence',
+    'principals',
+    'protocol',
+    'protocol_except',
+    'qos',
+    'pan_application',
+    'routing_instance',
+    'source_address',
+    'source_address_exclude',
+    'source_port',
+    'source_prefix',
+    'verbatim',
+    'packet_length',
+    'fragment_offset',
+    'hop_limit',
+    'icmp_type',
+    'icmp_code',
+    'ether_type',
+    'traffic_class_count',
+    'traffic_type',
+    'translated',
+    'dscp_set',
+    'dscp_match',
+    'dscp_except',
+    'next_ip',
+    'flexible_match_range',
+    'source_prefix_except',
+    'destination_prefix_except',
+    'vpn',
+    'source_tag',
+    'destination_tag',
+    'source_interface',
+    'destination_interface',
+    'platform',
+    'platform_exclude',
+    'timeout',
+    'flattened',
+    'flattened_addr',
+    'flattened_saddr',
+    'flattened_daddr',
+    'priority',
+    'source_service',
+    'destination_service'
+])
+
+# port fields accepting ranges, e.g.: [[1000, 2000], [3000, 4000]]
+_PORT_FIELDS = ('source_port', 'destination_port')
+
+# IP address fields, matching any of the prefixes in the list
+# the *_prefix fields are not included, as they reference prefix lists by name
+_ADDRESS_FIELDS = (
+    'address',
+    'address_exclude',
+    'source_address',
+    'source_address_exclude',
+    'destination_address',
+    'destination_address_exclude'
+)
+
 # ------------------------------------------------------------------------------
 # property functions
 # ------------------------------------------------------------------------------
@@ -69,8 +161,14 @@ __virtualname__ = 'netacl'
 def __virtual__():
     '''
     This module requires both NAPALM and Capirca.
+    Both are already required by the netacl execution module,
+    so there's no need to import them here as well.
     '''
-    if HAS_CAPIRCA and HAS_NAPALM:
+    if not (salt.utils.napalm.is_proxy(__opts__) or salt.utils.napalm.is_minion(__opts__)):
+        # not managing a network device, no need to look any further
+        return (False, 'The netacl state cannot be loaded: \
+                not running in a NAPALM (proxy) minion.')
+    if 'netacl.load_policy_config' in __salt__:
         return __virtualname__
     else:
         return (False, 'The netacl state cannot be loaded: \
@@ -80,6 +178,162 @@ def __virtual__():
 # helper functions -- will not be exported
 # ------------------------------------------------------------------------------
 
+
+def _dumps(obj):
+    '''
+    Serialize to JSON (as bytes) having the keys sorted, so the same input
+    always produces the same output. Uses orjson when available.
+    '''
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # e.g.: non-string keys, which the stdlib serializer is able to handle
+            log.debug('Unable to serialize using orjson, falling back to json')
+    return salt.utils.stringutils.to_bytes(salt.utils.json.dumps(obj, sort_keys=True))
+
+
+def _fingerprint(payload):
+    '''
+    Return a digest of the input used to generate the configuration.
+    '''
+    payload_str = _dumps(payload)
+    if hasattr(hashlib, 'blake2b'):
+        return hashlib.blake2b(payload_str, digest_size=16).hexdigest()
+    return hashlib.sha256(payload_str).hexdigest()
+
+
+def _fingerprint_grain(name):
+    '''
+    Return the grain key storing the fingerprint of the last input applied by a state.
+    '''
+    return 'netacl:fingerprints:{name}'.format(name=name)
+
+
+def _get_fingerprint(pillar_key, pillarenv, saltenv, merge_pillar, **payload):
+    '''
+    Return the fingerprint of the state input, including the pillar data when merged.
+    Return ``None`` when the input cannot be serialized.
+    '''
+    if merge_pillar:
+        payload['pillar'] = __salt__['pillar.get'](pillar_key,
+                                                   pillarenv=pillarenv,
+                                                   saltenv=saltenv)
+    payload['merge_pillar'] = merge_pillar
+    try:
+        return _fingerprint(payload)
+    except TypeError as err:
+        log.warning('Unable to fingerprint the input, the configuration will be loaded: {err}'.format(err=err))
+        return None
+
+
+def _is_port(value):
+    '''
+    Tell whether the value is a numeric port (booleans excluded).
+    '''
+    return isinstance(value, six.integer_types) and not isinstance(value, bool)
+
+
+def _merge_ranges(ranges):
+    '''
+    Sort and merge the overlapping port ranges, in a single pass.
+    Individual ports are considered ranges having the same start and end.
+    Values that are not numeric (e.g.: service names) are preserved as-is.
+    '''
+    intervals = []
+    others = []
+    for value in ranges:
+        if _is_port(value):
+            intervals.append((value, value))
+        elif isinstance(value, (tuple, list)) and len(value) == 2 and \
+                all(_is_port(port) for port in value) and value[0] <= value[1]:
+            intervals.append((value[0], value[1]))
+        else:
+            others.append(value)
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [start if start == end else [start, end] for start, end in merged] + others
+
+
+def _invalid_term_fields(term_fields):
+    '''
+    Return the sorted list of term fields not supported by Capirca,
+    as strings -- the fields that are not strings are invalid as well.
+    The Salt internal keyword arguments (e.g.: ``__pub_user``) are ignored.
+    '''
+    return sorted(six.text_type(field) for field in set(term_fields).difference(_VALID_TERM_FIELDS)
+                  if not isinstance(field, six.string_types) or not field.startswith('__'))
+
+
+def _normalize_prefixes(prefixes):
+    '''
+    Collapse the list of IP prefixes into the equivalent list of non-overlapping prefixes,
+    e.g.: ``['10.0.0.0/8', '10.1.0.0/16']`` becomes ``['10.0.0.0/8']``.
+    If any of the values is not a valid IP prefix, the list is returned unchanged.
+    '''
+    networks = {4: [], 6: []}
+    try:
+        for prefix in prefixes:
+            network = ipaddress.ip_network(six.text_type(prefix), strict=False)
+            networks[network.version].append(network)
+    except ValueError:
+        return prefixes
+    return [
+        six.text_type(network)
+        for version in (4, 6)
+        for network in ipaddress.collapse_addresses(networks[version])
+    ]
+
+
+def _normalize_term_fields(term_fields):
+    '''
+    Return a copy of the term fields, reduced to an equivalent smaller input for Capirca.
+    '''
+    term_fields = dict(term_fields or {})
+    for field in _PORT_FIELDS:
+        if isinstance(term_fields.get(field), (tuple, list)):
+            term_fields[field] = _merge_ranges(term_fields[field])
+    for field in _ADDRESS_FIELDS:
+        if isinstance(term_fields.get(field), (tuple, list)) and len(term_fields[field]) > 1:
+            term_fields[field] = _normalize_prefixes(term_fields[field])
+    return term_fields
+
+
+def _normalize_terms(terms):
+    '''
+    Return a new list of terms, having the fields of each term normalized.
+    '''
+    return [
+        {term_name: _normalize_term_fields(term_fields) for term_name, term_fields in six.iteritems(term_)}
+        if isinstance(term_, dict) else term_
+        for term_ in terms
+    ]
+
+
+def _normalize_filters(filters):
+    '''
+    Return a new list of filters, having the terms under each filter normalized.
+    The input filters are not altered.
+    '''
+    normalized_filters = []
+    for filter_ in filters:
+        if filter_ and isinstance(filter_, dict):
+            normalized_filter = {}
+            for filter_name, filter_config in six.iteritems(filter_):
+                if isinstance(filter_config, dict):
+                    filter_config = dict(filter_config)
+                    if filter_config.get('terms'):
+                        filter_config['terms'] = _normalize_terms(filter_config['terms'])
+                normalized_filter[filter_name] = filter_config
+            filter_ = normalized_filter
+        normalized_filters.append(filter_)
+    return normalized_filters
+
+
 # ------------------------------------------------------------------------------
 # callable functions
 # ------------------------------------------------------------------------------
@@ -201,6 +455,7 @@ def term(name,
         - log_name
         - loss_priority
         - option
+        - owner
         - policer
         - port
         - precedence
@@ -219,6 +474,7 @@ def term(name,
         - fragment_offset
         - hop_limit
         - icmp_type
+        - icmp_code
         - ether_type
         - traffic_class_count
         - traffic_type
@@ -235,11 +491,16 @@ def term(name,
         - destination_tag
         - source_interface
         - destination_interface
+        - platform
+        - platform_exclude
+        - timeout
         - flattened
         - flattened_addr
         - flattened_saddr
         - flattened_daddr
         - priority
+        - source_service
+        - destination_service
 
     .. note::
         The following fields can be also a single value and a list of values:
@@ -294,6 +555,8 @@ def term(name,
                 - 172.17.17.1/24
                 - 172.17.19.1/24
 
+        Overlapping prefixes in the address fields are collapsed before generating the configuration.
+
         or a list of services to be matched:
 
         .. code-block:: yaml
@@ -315,6 +578,7 @@ def term(name,
                 - [3000, 4000]
 
         With the configuration above, the user is able to select the 1000-2000 and 3000-4000 source port ranges.
+        Overlapping ranges are merged before generating the configuration.
 
     CLI Example:
 
@@ -415,10 +679,16 @@ def term(name,
         recommended to use the json serializer explicitly (`` | json``),
         instead of relying on the default Python serializer.
     '''
-    ret = salt.utils.napalm.default_ret(name)
+    ret = _default_ret(name)
     test = __opts__['test'] or test
+    revision_id = revision_id or name
     if not filter_options:
         filter_options = []
+    invalid_fields = _invalid_term_fields(term_fields)
+    if invalid_fields:
+        ret['comment'] = 'Invalid term fields: {fields}'.format(fields=', '.join(invalid_fields))
+        return ret
+    term_fields = _normalize_term_fields(term_fields)
     loaded = __salt__['netacl.load_term_config'](filter_name,
                                                  term_name,
                                                  filter_options=filter_options,
@@ -426,7 +696,7 @@ def term(name,
                                                  pillarenv=pillarenv,
                                                  saltenv=saltenv,
                                                  merge_pillar=merge_pillar,
-                                                 revision_id=revision_id if revision_id else name,
+                                                 revision_id=revision_id,
                                                  revision_no=revision_no,
                                                  revision_date=revision_date,
                                                  revision_date_format=revision_date_format,
@@ -436,13 +706,150 @@ def term(name,
                                                  commit=commit,
                                                  debug=debug,
                                                  **term_fields)
-    return salt.utils.napalm.loaded_ret(ret, loaded, test, debug)
+    return _loaded_ret(ret, loaded, test, debug)
+
+
+def terms(name,
+          filter_name,
+          terms,  # pylint: disable=redefined-outer-name
+          filter_options=None,
+          pillar_key='acl',
+          pillarenv=None,
+          saltenv=None,
+          merge_pillar=False,
+          revision_id=None,
+          revision_no=None,
+          revision_date=True,
+          revision_date_format='%Y/%m/%d',
+          test=False,
+          commit=True,
+          debug=False):
+    '''
+    Manage the configuration of several terms under the same policy filter.
+    Unlike using one ``term`` state for each term, this generates the configuration
+    of all the terms through a single Capirca policy, and loads it on the device at once.
+
+    .. versionadded:: Fluorine
+
+    filter_name
+        The name of the policy filter.
+
+    terms
+        The terms to be managed, either as a dictionary having the term names as keys
+        and the term fields as values, or as a list of single-key dictionaries,
+        using the same structure as the pillar. The term fields are the same as
+        accepted by the ``term`` state, including ``source_service`` and ``destination_service``.
+
+        .. note::
+            The order of the terms is very important: when it matters,
+            prefer the list structure, as the order of a dictionary is not guaranteed.
+
+    filter_options
+        Additional filter options. These options are platform-specific.
+        See the complete list of options_.
+
+        .. _options: https://github.com/google/capirca/wiki/Policy-format#header-section
+
+    pillar_key: ``acl``
+        The key in the pillar containing the default attributes values. Default: ``acl``.
+
+    pillarenv
+        Query the master to generate fresh pillar data on the fly,
+        specifically from the requested pillar environment.
+
+    saltenv
+        Included only for compatibility with
+        :conf_minion:`pillarenv_from_saltenv`, and is otherwise ignored.
+
+    merge_pillar: ``False``
+        Merge the fields of each term with the corresponding values from the pillar. Default: ``False``.
+
+        The properties specified through the state arguments have higher priority than the pillar.
+
+        .. note::
+            Only the terms listed in ``terms`` are managed: the terms defined in the pillar
+            for this filter, but not listed in ``terms``, are not included in the configuration.
+
+    revision_id
+        Add a comment in the filter config having the description for the changes applied.
+
+    revision_no
+        The revision count.
+
+    revision_date: ``True``
+        Boolean flag: display the date when the filter configuration was generated. Default: ``True``.
+
+    revision_date_format: ``%Y/%m/%d``
+        The date format to be used when generating the perforce data. Default: ``%Y/%m/%d`` (<year>/<month>/<day>).
+
+    test: ``False``
+        Dry run? If set as ``True``, will apply the config, discard and return the changes.
+        Default: ``False`` and will commit the changes on the device.
+
+    commit: ``True``
+        Commit? Default: ``True``.
+
+    debug: ``False``
+        Debug mode. Will insert a new key under the output dictionary,
+        as ``loaded_config`` contaning the raw configuration loaded on the device.
+
+    State SLS example:
+
+    .. code-block:: yaml
+
+        update_block_icmp_terms:
+          netacl.terms:
+            - filter_name: block-icmp
+            - filter_options:
+                - not-interface-specific
+            - terms:
+                - first-term:
+                    protocol: icmp
+                    action: reject
+                - second-term:
+                    protocol: tcp
+                    destination_service: ssh
+                    action: accept
+    '''
+    ret = _default_ret(name)
+    test = __opts__['test'] or test
+    revision_id = revision_id or name
+    if not filter_options:
+        filter_options = []
+    if isinstance(terms, dict):
+        terms = [{term_name: term_fields} for term_name, term_fields in six.iteritems(terms)]
+    invalid_fields = sorted(set(
+        field
+        for term_ in terms if isinstance(term_, dict)
+        for term_fields in six.itervalues(term_)
+        for field in _invalid_term_fields(term_fields or {})
+    ))
+    if invalid_fields:
+        ret['comment'] = 'Invalid term fields: {fields}'.format(fields=', '.join(invalid_fields))
+        return ret
+    terms = _normalize_terms(terms)
+    loaded = __salt__['netacl.load_filter_config'](filter_name,
+                                                   filter_options=filter_options,
+                                                   terms=terms,
+                                                   pillar_key=pillar_key,
+                                                   pillarenv=pillarenv,
+                                                   saltenv=saltenv,
+                                                   merge_pillar=merge_pillar,
+                                                   only_lower_merge=True,
+                                                   revision_id=revision_id,
+                                                   revision_no=revision_no,
+                                                   revision_date=revision_date,
+                                                   revision_date_format=revision_date_format,
+                                                   test=test,
+                                                   commit=commit,
+                                                   debug=debug)
+    return _loaded_ret(ret, loaded, test, debug)
 
 
 def filter(name,  # pylint: disable=redefined-builtin
            filter_name,
            filter_options=None,
-           terms=None,
+           terms=None,  # pylint: disable=redefined-outer-name
            prepend=True,
            pillar_key='acl',
            pillarenv=None,
@@ -455,7 +862,8 @@ def filter(name,  # pylint: disable=redefined-builtin
            revision_date_format='%Y/%m/%d',
            test=False,
            commit=True,
-           debug=False):
+           debug=False,
+           skip_unchanged=False):
     '''
     Generate and load the configuration of a policy filter.
 
@@ -473,6 +881,10 @@ def filter(name,  # pylint: disable=redefined-builtin
         If not specified or empty, will try to load the configuration from the pillar,
         unless ``merge_pillar`` is set as ``False``.
 
+        The overlapping port ranges under ``source_port`` and ``destination_port`` are merged,
+        and the overlapping prefixes in the address fields are collapsed,
+        before generating the configuration.
+
     prepend: ``True``
         When ``merge_pillar`` is set as ``True``, the final list of terms generated by merging
         the terms from ``terms`` with those defined in the pillar (if any): new terms are prepended
@@ -525,10 +937,28 @@ def filter(name,  # pylint: disable=redefined-builtin
     commit: ``True``
         Commit? Default: ``True``.
 
+        When managing several filters through separate states on an always-alive proxy,
+        set ``commit`` as ``False`` on all but the last one, so the candidate configuration
+        accumulates the changes and they are committed in a single operation. Otherwise,
+        prefer the ``managed`` state, which loads and commits the whole policy at once.
+
     debug: ``False``
         Debug mode. Will insert a new key under the output dictionary,
         as ``loaded_config`` contaning the raw configuration loaded on the device.
 
+    skip_unchanged: ``False``
+        Do not generate and load the configuration when the input of the state
+        (including the pillar data, when ``merge_pillar`` is ``True``) did not change
+        since the last time it has been successfully committed. Default: ``False``.
+
+        .. versionadded:: Fluorine
+
+        .. note::
+            A fingerprint of the input is stored in the ``netacl:fingerprints`` grain.
+            Changes applied on the device by other means are not detected,
+            and the revision date is not refreshed while the input is unchanged.
+            In test mode, the configuration is always generated.
+
     CLI Example:
 
     .. code-block:: bash
@@ -645,12 +1075,36 @@ def filter(name,  # pylint: disable=redefined-builtin
         recommended to use the json serializer explicitly (`` | json``),
         instead of relying on the default Python serializer.
     '''
-    ret = salt.utils.napalm.default_ret(name)
+    ret = _default_ret(name)
     test = __opts__['test'] or test
+    revision_id = revision_id or name
     if not filter_options:
         filter_options = []
     if not terms:
         terms = []
+    terms = _normalize_terms(terms)
+    fingerprint = None
+    if skip_unchanged and not test:
+        # the fingerprint is not used in test mode: the configuration is always generated
+        fingerprint = _get_fingerprint(pillar_key,
+                                       pillarenv,
+                                       saltenv,
+                                       merge_pillar,
+                                       filter_name=filter_name,
+                                       filter_options=filter_options,
+                                       terms=terms,
+                                       prepend=prepend,
+                                       only_lower_merge=only_lower_merge,
+                                       revision_id=revision_id,
+                                       revision_no=revision_no,
+                                       revision_date=revision_date,
+                                       revision_date_format=revision_date_format)
+        if fingerprint and __salt__['grains.get'](_fingerprint_grain(name)) == fingerprint:
+            ret.update({
+                'result': True,
+                'comment': 'Already configured: the input did not change since the last run.'
+            })
+            return ret
     loaded = __salt__['netacl.load_filter_config'](filter_name,
                                                    filter_options=filter_options,
                                                    terms=terms,
@@ -660,14 +1114,17 @@ def filter(name,  # pylint: disable=redefined-builtin
                                                    saltenv=saltenv,
                                                    merge_pillar=merge_pillar,
                                                    only_lower_merge=only_lower_merge,
-                                                   revision_id=revision_id if revision_id else name,
+                                                   revision_id=revision_id,
                                                    revision_no=revision_no,
                                                    revision_date=revision_date,
                                                    revision_date_format=revision_date_format,
                                                    test=test,
                                                    commit=commit,
                                                    debug=debug)
-    return salt.utils.napalm.loaded_ret(ret, loaded, test, debug)
+    ret = _loaded_ret(ret, loaded, test, debug)
+    if fingerprint and ret['result'] and not test and commit:
+        __salt__['grains.set'](_fingerprint_grain(name), fingerprint, force=True)
+    return ret
 
 
 def managed(name,
@@ -684,15 +1141,22 @@ def managed(name,
             revision_date_format='%Y/%m/%d',
             test=False,
             commit=True,
-            debug=False):
+            debug=False,
+            skip_unchanged=False):
     '''
     Manage the whole firewall configuration.
+    The configuration of all the filters is generated and loaded on the device
+    in a single session, and committed once.
 
     filters
         Dictionary of filters for this policy.
         If not specified or empty, will try to load the configuration from the pillar,
         unless ``merge_pillar`` is set as ``False``.
 
+        The overlapping port ranges under ``source_port`` and ``destination_port`` are merged,
+        and the overlapping prefixes in the address fields are collapsed,
+        in the terms of each filter, before generating the configuration.
+
     prepend: ``True``
         When ``merge_pillar`` is set as ``True``, the final list of filters generated by merging
         the filters from ``filters`` with those defined in the pillar (if any): new filters are prepended
@@ -749,6 +1213,14 @@ def managed(name,
         Debug mode. Will insert a new key under the output dictionary,
         as ``loaded_config`` contaning the raw configuration loaded on the device.
 
+    skip_unchanged: ``False``
+        Do not generate and load the configuration when the input of the state
+        (including the pillar data, when ``merge_pillar`` is ``True``) did not change
+        since the last time it has been successfully committed. Default: ``False``.
+        See the ``filter`` state for more details.
+
+        .. versionadded:: Fluorine
+
     CLI Example:
 
     .. code-block:: bash
@@ -942,10 +1414,32 @@ def managed(name,
         recommended to use the json serializer explicitly (`` | json``),
         instead of relying on the default Python serializer.
     '''
-    ret = salt.utils.napalm.default_ret(name)
+    ret = _default_ret(name)
     test = __opts__['test'] or test
+    revision_id = revision_id or name
     if not filters:
         filters = []
+    filters = _normalize_filters(filters)
+    fingerprint = None
+    if skip_unchanged and not test:
+        # the fingerprint is not used in test mode: the configuration is always generated
+        fingerprint = _get_fingerprint(pillar_key,
+                                       pillarenv,
+                                       saltenv,
+                                       merge_pillar,
+                                       filters=filters,
+                                       prepend=prepend,
+                                       only_lower_merge=only_lower_merge,
+                                       revision_id=revision_id,
+                                       revision_no=revision_no,
+                                       revision_date=revision_date,
+                                       revision_date_format=revision_date_format)
+        if fingerprint and __salt__['grains.get'](_fingerprint_grain(name)) == fingerprint:
+            ret.update({
+                'result': True,
+                'comment': 'Already configured: the input did not change since the last run.'
+            })
+            return ret
     loaded = __salt__['netacl.load_policy_config'](filters=filters,
                                                    prepend=prepend,
                                                    pillar_key=pillar_key,
@@ -953,11 +1447,14 @@ def managed(name,
                                                    saltenv=saltenv,
                                                    merge_pillar=merge_pillar,
                                                    only_lower_merge=only_lower_merge,
-                                                   revision_id=revision_id if revision_id else name,
+                                                   revision_id=revision_id,
                                                    revision_no=revision_no,
                                                    revision_date=revision_date,
                                                    revision_date_format=revision_date_format,
                                                    test=test,
                                                    commit=commit,
                                                    debug=debug)
-    return salt.utils.napalm.loaded_ret(ret, loaded, test, debug)
+    ret = _loaded_ret(ret, loaded, test, debug)
+    if fingerprint and ret['result'] and not test and commit:
+        __salt__['grains.set'](_fingerprint_grain(name), fingerprint, force=True)
+    return ret
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for the capirca execution module.
+'''
+
+# Import Python Libs
+from __future__ import absolute_import, unicode_literals, print_function
+
+# Import Salt Testing Libs
+from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import (
+    MagicMock,
+    patch,
+    NO_MOCK,
+    NO_MOCK_REASON
+)
+
+# Import Salt Libs
+import salt.modules.capirca_acl as capirca_acl
+
+BLOCK_BOGONS = {
+    'block-bogons': {
+        'source_address': ['0.0.0.0/8', '10.0.0.0/8'],
+        'action': 'reject'
+    }
+}
+
+
+def _filters():
+    '''
+    Two filters sharing the same term.
+    '''
+    return [
+        {'my-filter': {'terms': [BLOCK_BOGONS, {'allow-ssh': {'protocol': 'tcp', 'action': 'accept'}}]}},
+        {'my-other-filter': {'terms': [BLOCK_BOGONS]}}
+    ]
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+@skipIf(not capirca_acl.HAS_CAPIRCA, 'Capirca is not installed')
+class CapircaAclTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Test cases for salt.modules.capirca_acl
+    '''
+    def setup_loader_modules(self):
+        return {
+            capirca_acl: {
+                '__salt__': {}
+            }
+        }
+
+    def _get_policy_terms(self, **kwargs):
+        '''
+        Build the policy object and return the terms of each filter,
+        together with the mock cleaning up the term options.
+        '''
+        mock_generator = MagicMock(return_value='test_config')
+        mock_clean = MagicMock(side_effect=dict)
+        with patch.object(capirca_acl, '_import_platform_generator', MagicMock(return_value=mock_generator)), \
+                patch.object(capirca_acl, '_clean_term_opts', mock_clean):
+            ret = capirca_acl._get_policy_object('juniper', filters=_filters(), **kwargs)
+        self.assertEqual(ret, 'test_config')
+        policy = mock_generator.call_args[0][0]
+        return [filter_terms for _, filter_terms in policy.filters], mock_clean
+
+    def test_get_policy_object_repeated_term(self):
+        '''
+        Test that the term repeated under several filters is cleaned up only once
+        '''
+        policy_terms, mock_clean = self._get_policy_terms(merge_pillar=False)
+        self.assertEqual(mock_clean.call_count, 2)
+        first_term, second_term = policy_terms[0][0], policy_terms[1][0]
+        self.assertEqual(first_term.name, 'block-bogons')
+        self.assertEqual(second_term.name, 'block-bogons')
+        self.assertEqual(first_term.source_address, second_term.source_address)
+        # the terms do not share the lists, so they can be altered independently
+        self.assertIsNot(first_term.source_address, second_term.source_address)
+        self.assertEqual(policy_terms[0][1].name, 'allow-ssh')
+
+    def test_get_policy_object_merge_pillar(self):
+        '''
+        Test that each term is merged with its own pillar data
+        '''
+        mock_pillar = MagicMock(side_effect=lambda filter_name, term_name, **kwargs: {'counter': filter_name})
+        with patch.object(capirca_acl, 'get_term_pillar', mock_pillar):
+            policy_terms, mock_clean = self._get_policy_terms(merge_pillar=True)
+        self.assertEqual(mock_pillar.call_count, 3)
+        # the pillar data and the term fields, for each term
+        self.assertEqual(mock_clean.call_count, 6)
+        self.assertEqual(policy_terms[0][0].counter, 'my-filter')
+        self.assertEqual(policy_terms[1][0].counter, 'my-other-filter')
+        self.assertEqual(policy_terms[1][0].action, 'reject')
@@ -97,6 +97,14 @@ class NapalmAclModuleTestCase(TestCase, LoaderModuleMockMixin):
         ret = napalm_acl.load_policy_config('test_filter', 'test_term')
         assert ret['already_configured'] is False
 
+    def test_get_filter_config(self):
+        ret = napalm_acl.get_filter_config('test_filter')
+        assert ret == 'test_config'
+
+    def test_get_policy_config(self):
+        ret = napalm_acl.get_policy_config()
+        assert ret == 'test_config'
+
     def test_get_filter_pillar(self):
         ret = napalm_acl.get_filter_pillar('test_filter')
         assert ret['test'] == 'value'
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+'''
+Unit tests for the netacl state.
+'''
+
+# Import Python Libs
+from __future__ import absolute_import, unicode_literals, print_function
+
+# Import Salt Testing Libs
+from tests.support.mixins import LoaderModuleMockMixin
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import (
+    MagicMock,
+    patch,
+    NO_MOCK,
+    NO_MOCK_REASON
+)
+
+# Import Salt Libs
+import salt.modules.capirca_acl as capirca_acl
+import salt.states.netacl as netacl
+
+LOADED = {
+    'result': True,
+    'comment': 'Testing mode: Configuration discarded.',
+    'already_configured': False,
+    'diff': '+ term my-term',
+}
+
+TERMS = [
+    {
+        'my-term': {
+            'source_port': [1234, 1235],
+            'action': 'reject'
+        }
+    }
+]
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class NetaclTestCase(TestCase, LoaderModuleMockMixin):
+    '''
+    Test cases for salt.states.netacl
+    '''
+    def setup_loader_modules(self):
+        return {
+            netacl: {
+                '__opts__': {'test': False},
+                '__salt__': {}
+            }
+        }
+
+    def test_filter_revision_id(self):
+        '''
+        Test that the revision ID defaults to the name of the state
+        '''
+        mock_load = MagicMock(return_value=LOADED)
+        with patch.dict(netacl.__salt__, {'netacl.load_filter_config': mock_load}):
+            ret = netacl.filter('my-filter-state', 'my-filter', terms=TERMS, test=True)
+            self.assertIsNone(ret['result'])
+            _, kwargs = mock_load.call_args
+            self.assertEqual(kwargs['revision_id'], 'my-filter-state')
+            netacl.filter('my-filter-state', 'my-filter', terms=TERMS, revision_id='my-change', test=True)
+            _, kwargs = mock_load.call_args
+            self.assertEqual(kwargs['revision_id'], 'my-change')
+
+    def test_filter_normalize_terms(self):
+        '''
+        Test that the terms are normalized, without altering the input
+        '''
+        terms = [{'my-term': {'source_port': [1234, [1000, 2000]], 'action': 'reject'}}]
+        mock_load = MagicMock(return_value=LOADED)
+        with patch.dict(netacl.__salt__, {'netacl.load_filter_config': mock_load}):
+            netacl.filter('my-filter-state', 'my-filter', terms=terms, test=True)
+        _, kwargs = mock_load.call_args
+        self.assertEqual(kwargs['terms'], [{'my-term': {'source_port': [[1000, 2000]], 'action': 'reject'}}])
+        self.assertEqual(terms, [{'my-term': {'source_port': [1234, [1000, 2000]], 'action': 'reject'}}])
+
+    def test_filter_skip_unchanged(self):
+        '''
+        Test that the filter is not loaded again when the input did not change
+        '''
+        loaded = dict(LOADED, comment='Configuration changed.')
+        mock_load = MagicMock(return_value=loaded)
+        mock_grains_set = MagicMock()
+        with patch.dict(netacl.__salt__, {'netacl.load_filter_config': mock_load,
+                                          'grains.get': MagicMock(return_value=None),
+                                          'grains.set': mock_grains_set}):
+            ret = netacl.filter('my-filter-state', 'my-filter', terms=TERMS, skip_unchanged=True)
+            self.assertTrue(ret['result'])
+            self.assertEqual(mock_grains_set.call_count, 1)
+        grain_key, fingerprint = mock_grains_set.call_args[0]
+        self.assertEqual(grain_key, 'netacl:fingerprints:my-filter-state')
+        with patch.dict(netacl.__salt__, {'netacl.load_filter_config': mock_load,
+                                          'grains.get': MagicMock(return_value=fingerprint)}):
+            ret = netacl.filter('my-filter-state', 'my-filter', terms=TERMS, skip_unchanged=True)
+            self.assertTrue(ret['result'])
+            self.assertEqual(ret['changes'], {})
+            self.assertEqual(mock_load.call_count, 1)
+
+    def test_terms_from_dict(self):
+        '''
+        Test that the terms given as dictionary are loaded through a single filter config
+        '''
+        mock_load = MagicMock(return_value=LOADED)
+        with patch.dict(netacl.__salt__, {'netacl.load_filter_config': mock_load}):
+            ret = netacl.terms('my-terms-state', 'my-filter', {'my-term': TERMS[0]['my-term']}, test=True)
+            self.assertIsNone(ret['result'])
+            self.assertEqual(mock_load.call_count, 1)
+            _, kwargs = mock_load.call_args
+            self.assertEqual(kwargs['terms'], TERMS)
+            self.assertTrue(kwargs['only_lower_merge'])
+
+    def test_managed_skip_unchanged(self):
+        '''
+        Test that the policy is not loaded again when the input did not change
+        '''
+        loaded = dict(LOADED, comment='Configuration changed.')
+        mock_load = MagicMock(return_value=loaded)
+        mock_grains_set = MagicMock()
+        filters = [{'my-filter': {'terms': TERMS}}]
+        with patch.dict(netacl.__salt__, {'netacl.load_policy_config': mock_load,
+                                          'grains.get': MagicMock(return_value=None),
+                                          'grains.set': mock_grains_set}):
+            ret = netacl.managed('my-policy-state', filters=filters, skip_unchanged=True)
+            self.assertTrue(ret['result'])
+            self.assertEqual(mock_grains_set.call_count, 1)
+        grain_key, fingerprint = mock_grains_set.call_args[0]
+        self.assertEqual(grain_key, 'netacl:fingerprints:my-policy-state')
+        with patch.dict(netacl.__salt__, {'netacl.load_policy_config': mock_load,
+                                          'grains.get': MagicMock(return_value=fingerprint)}):
+            ret = netacl.managed('my-policy-state', filters=filters, skip_unchanged=True)
+            self.assertTrue(ret['result'])
+            self.assertEqual(ret['changes'], {})
+            self.assertEqual(mock_load.call_count, 1)
+
+    def test_get_fingerprint_not_serializable(self):
+        '''
+        Test that no fingerprint is returned when the input cannot be serialized
+        '''
+        self.assertIsNone(netacl._get_fingerprint('acl', None, None, False, terms=[{'my-term': object()}]))
+        self.assertTrue(netacl._get_fingerprint('acl', None, None, False, terms=TERMS))
+
+    def test_merge_ranges(self):
+        '''
+        Test that the overlapping port ranges are merged
+        '''
+        ranges = [[3000, 4000], 1234, [1000, 2000], 1235, [1500, 2500], 'ntp', 3500]
+        self.assertEqual(netacl._merge_ranges(ranges),
+                         [[1000, 2500], [3000, 4000], 'ntp'])
+        self.assertEqual(netacl._merge_ranges([1234, 1235]), [1234, 1235])
+        self.assertEqual(netacl._merge_ranges([[True, 3], [1, 5]]), [[1, 5], [True, 3]])
+
+    def test_normalize_filters(self):
+        '''
+        Test that the terms of each filter are normalized into a new list, preserving the order
+        '''
+        filters = [
+            {'my-filter': {'options': ['inet6'], 'terms': [{'my-term': {'source_port': [3000, [1000, 2000], 1500]}}]}},
+            {'block-icmp': {'terms': [{'first-term': {'protocol': 'icmp', 'action': 'reject'}}, {'empty-term': None}]}},
+            {'empty-filter': None}
+        ]
+        self.assertEqual(netacl._normalize_filters(filters), [
+            {'my-filter': {'options': ['inet6'], 'terms': [{'my-term': {'source_port': [[1000, 2000], 3000]}}]}},
+            {'block-icmp': {'terms': [{'first-term': {'protocol': 'icmp', 'action': 'reject'}}, {'empty-term': {}}]}},
+            {'empty-filter': None}
+        ])
+        # the input is not altered
+        self.assertEqual(filters[0]['my-filter']['terms'], [{'my-term': {'source_port': [3000, [1000, 2000], 1500]}}])
+        self.assertEqual(filters[1]['block-icmp']['terms'][1], {'empty-term': None})
+
+    def test_valid_term_fields(self):
+        '''
+        Test that the accepted term fields match the fields supported by the capirca module
+        '''
+        self.assertEqual(netacl._VALID_TERM_FIELDS,
+                         set(capirca_acl._TERM_FIELDS) | {'source_service', 'destination_service'})
+
+    def test_term_invalid_fields(self):
+        '''
+        Test that the term is not loaded when having fields not supported by Capirca
+        '''
+        mock_load = MagicMock(return_value=LOADED)
+        with patch.dict(netacl.__salt__, {'netacl.load_term_config': mock_load}):
+            ret = netacl.term('my-term-state', 'my-filter', 'my-term',
+                              action='accept', protocl='tcp', __pub_user='root')
+            self.assertFalse(ret['result'])
+            self.assertEqual(ret['comment'], 'Invalid term fields: protocl')
+            self.assertEqual(mock_load.call_count, 0)
+
+    def test_terms_invalid_fields(self):
+        '''
+        Test that the terms are not loaded when having fields that are not strings
+        '''
+        mock_load = MagicMock(return_value=LOADED)
+        with patch.dict(netacl.__salt__, {'netacl.load_filter_config': mock_load}):
+            ret = netacl.terms('my-terms-state', 'my-filter', {'my-term': {'action': 'accept', 80: 'tcp'}})
+            self.assertFalse(ret['result'])
+            self.assertEqual(ret['comment'], 'Invalid term fields: 80')
+            self.assertEqual(mock_load.call_count, 0)
+
+    def test_normalize_prefixes(self):
+        '''
+        Test that the nested prefixes are collapsed
+        '''
+        prefixes = ['10.1.0.0/16', '2001:db8:1::/48', '10.0.0.0/8', '2001:db8::/32', '172.17.17.1/24']
+        self.assertEqual(netacl._normalize_prefixes(prefixes),
+                         ['10.0.0.0/8', '172.17.17.0/24', '2001:db8::/32'])
+        self.assertEqual(netacl._normalize_prefixes(['10.0.0.0/8', 'not-a-prefix']),
+                         ['10.0.0.0/8', 'not-a-prefix'])